@@ -13,20 +13,93 @@ Usage: python3 benchmark-etcd-cluster.py [options]
 
 import argparse
 import asyncio
-import concurrent.futures
-import etcd3
-import json
+import aetcd
+import crick
+import math
+import multiprocessing
+import numpy as np
+import orjson
+import os
 import random
-import statistics
 import string
 import sys
-import threading
 import time
-from collections import defaultdict
-from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Set, Tuple
+
+# Operation type indices for per-client statistics
+READ = 0
+WRITE = 1
+
+# Pre-generated keys and values per client, indexed with random bits
+KEY_POOL_BITS = 12  # 4096 keys
+VALUE_POOL_BITS = 8  # 256 values
+KEY_ALPHABET = (string.ascii_letters + string.digits).encode()
+
+# etcd's default --max-txn-ops: the most operations one Txn may carry
+MAX_TXN_OPS = 128
+
+# etcd's default --max-request-bytes, less headroom for the request envelope,
+# and an allowance per put for its protobuf framing
+MAX_REQUEST_BYTES = 1536 * 1024 - 4096
+TXN_OP_OVERHEAD = 32
+
+# Latencies buffered per stream before being folded into the summaries
+FLUSH_SIZE = 4096
+
+# Clients publish their operation count for progress reports every N operations
+PROGRESS_INTERVAL = 100
+
+
+def max_txn_puts(key_size: int, value_size: int) -> int:
+    """Most puts of this size one Txn may carry within etcd's default limits"""
+    per_op = key_size + value_size + TXN_OP_OVERHEAD
+    return max(1, min(MAX_TXN_OPS, MAX_REQUEST_BYTES // per_op))
+
+
+@dataclass(slots=True)
+class OnlineStats:
+    """Mergeable count, mean, variance, min and max of a latency stream"""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = 0.0
+
+    @classmethod
+    def from_samples(cls, x: np.ndarray, weights: np.ndarray) -> "OnlineStats":
+        """Summarize a chunk of weighted samples in one vectorized pass"""
+        n = weights.sum()
+        mean = float(np.dot(weights, x) / n)
+        return cls(
+            n=int(n),
+            mean=mean,
+            m2=float(np.dot(weights, (x - mean) ** 2)),
+            min=float(x.min()),
+            max=float(x.max()),
+        )
+
+    def merge(self, other: "OnlineStats") -> "OnlineStats":
+        """Combine two summaries with the parallel variant of the algorithm"""
+        n = self.n + other.n
+        if not n:
+            return OnlineStats()
+        delta = other.mean - self.mean
+        return OnlineStats(
+            n=n,
+            mean=self.mean + delta * other.n / n,
+            m2=self.m2 + other.m2 + delta * delta * self.n * other.n / n,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+        )
+
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation"""
+        return math.sqrt(self.m2 / self.n) if self.n else 0.0
 
 
 @dataclass
@@ -42,18 +115,13 @@ class BenchmarkConfig:
     key_prefix: str = "benchmark"
     warmup_time: int = 5
     report_interval: int = 5
-
-
-@dataclass
-class OperationResult:
-    """Result of a single operation"""
-
-    operation: str  # 'read' or 'write'
-    success: bool
-    latency_ms: float
-    timestamp: float
-    endpoint: str
-    error: str = ""
+    inflight: int = 16
+    batch_size: int = 1
+    batch_max_size: int = 1
+    batch_max_wait_us: int = 0
+    pool_size: int = 8
+    target_rate: float = 0
+    open_loop: bool = False
 
 
 @dataclass
@@ -81,153 +149,505 @@ class BenchmarkResults:
     write_latency_stats: Dict[str, float] = None
     endpoint_distribution: Dict[str, int] = None
     errors: List[str] = None
+    throughput_timeline: List[float] = None  # ops/sec for each second of the run
+
+
+@dataclass(slots=True)
+class ClientStats:
+    """Picklable summary of one client's run, returned by its worker process"""
+
+    stats: List[List[OnlineStats]]
+    digests: List[crick.TDigest]
+    endpoint_counts: List[int]
+    errors: Set[str]
+    timeline: List[int]
+    started_ns: int
+    finished_ns: int
+
+
+class EtcdSessionPool:
+    """Round-robin pool of etcd sessions shared by every client in the process"""
+
+    def __init__(self, config: BenchmarkConfig):
+        self.config = config
+        # Ring of (endpoint index, session) pairs, interleaved across endpoints
+        self._sessions: List[Tuple[int, aetcd.Client]] = []
+        self._next = 0
+
+    async def connect(self):
+        """Open `pool_size` asyncio etcd sessions per endpoint"""
+        # Parse each endpoint once, not once per pooled session
+        addresses = [
+            endpoint.replace("http://", "").split(":")
+            for endpoint in self.config.endpoints
+        ]
+        for _ in range(self.config.pool_size):
+            for endpoint_idx, (host, port) in enumerate(addresses):
+                endpoint = self.config.endpoints[endpoint_idx]
+                # A local subchannel pool gives each session its own connection,
+                # and keepalive pings keep idle ones from being torn down
+                client = aetcd.Client(
+                    host=host,
+                    port=int(port),
+                    options={
+                        "grpc.use_local_subchannel_pool": 1,
+                        "grpc.keepalive_time_ms": 10_000,
+                    },
+                )
+                try:
+                    await client.connect()
+                    self._sessions.append((endpoint_idx, client))
+                except Exception as e:
+                    print(f"Failed to connect to {endpoint}: {e}")
+
+        if not self._sessions:
+            raise RuntimeError("No etcd endpoint could be connected")
+
+    async def close(self):
+        """Close all etcd sessions in the pool"""
+        for _, client in self._sessions:
+            await client.close()
+        self._sessions.clear()
+
+    def next_session(self) -> Tuple[int, aetcd.Client]:
+        """Pick the next session in round-robin order"""
+        endpoint_idx, client = self._sessions[self._next % len(self._sessions)]
+        self._next += 1
+        return endpoint_idx, client
+
+
+class TxnBatcher:
+    """Packs operations queued concurrently per endpoint into shared etcd Txns"""
+
+    def __init__(self, config: BenchmarkConfig):
+        self.max_size = config.batch_max_size
+        self.max_wait = config.batch_max_wait_us / 1e6
+        self._queues = [asyncio.Queue() for _ in config.endpoints]
+        self._dispatchers: List[asyncio.Task] = []
+
+    def start(self):
+        """Start one dispatcher per endpoint queue"""
+        self._dispatchers = [
+            asyncio.create_task(self._dispatch(queue)) for queue in self._queues
+        ]
+
+    async def stop(self):
+        """Stop the dispatchers; callers have awaited all submitted operations"""
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+
+    def submit(
+        self, endpoint_idx: int, client: aetcd.Client, key: bytes, value: bytes = None
+    ) -> asyncio.Future:
+        """Queue a put (or a get when `value` is None) for the next Txn"""
+        future = asyncio.get_running_loop().create_future()
+        self._queues[endpoint_idx].put_nowait((client, key, value, future))
+        return future
+
+    async def _dispatch(self, queue: asyncio.Queue):
+        item = None
+        while True:
+            if item is None:
+                item = await queue.get()
+            if self.max_wait and queue.qsize() < self.max_size - 1:
+                # Give concurrent requests a short window to join this Txn
+                await asyncio.sleep(self.max_wait)
+
+            batch = []
+            put_keys = set()
+            while item is not None and len(batch) < self.max_size:
+                _, key, value, _ = item
+                if value is not None:
+                    if key in put_keys:
+                        break  # etcd rejects a Txn that puts the same key twice
+                    put_keys.add(key)
+                batch.append(item)
+                item = None if queue.empty() else queue.get_nowait()
+
+            # One Txn in flight per endpoint: operations pile up in the queue
+            # while it runs, and the next Txn carries all of them
+            await self._commit(batch)
+
+    async def _commit(self, batch: list):
+        client = batch[0][0]
+        ops = [
+            (
+                client.transactions.get(key)
+                if value is None
+                else client.transactions.put(key, value)
+            )
+            for _, key, value, _ in batch
+        ]
+        try:
+            _, responses = await client.transaction(compare=[], success=ops, failure=[])
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            # Hand each caller the response for its own operation
+            for (*_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
 
 
 class EtcdBenchmarkClient:
     """Individual benchmark client for etcd operations"""
 
-    def __init__(self, client_id: int, config: BenchmarkConfig):
+    def __init__(
+        self,
+        client_id: int,
+        config: BenchmarkConfig,
+        sessions: EtcdSessionPool,
+        progress=None,
+        batcher: TxnBatcher = None,
+    ):
         self.client_id = client_id
         self.config = config
-        self.results: List[OperationResult] = []
+        self.sessions = sessions
+        self.batcher = batcher
+        # Shared per-client operation counts read by the progress reporter
+        self.progress = progress
         self.running = False
-        self.etcd_clients = {}
-
-        # Initialize etcd clients for each endpoint
-        for endpoint in config.endpoints:
-            host, port = endpoint.replace("http://", "").split(":")
-            try:
-                client = etcd3.client(host=host, port=int(port))
-                self.etcd_clients[endpoint] = client
-            except Exception as e:
-                print(f"Failed to connect to {endpoint}: {e}")
+        # Private RNG avoids contention on the shared module-level generator
+        self._rng = random.Random(client_id)
+        # Streaming latency summaries in ms, indexed [operation][success]
+        self.stats = [[OnlineStats(), OnlineStats()] for _ in (READ, WRITE)]
+        # t-digest of successful latencies per operation type, for percentiles
+        self.digests = [crick.TDigest() for _ in (READ, WRITE)]
+        # Preallocated (latency, weight) buffers feeding the above in chunks,
+        # with their fill levels; reused after every flush
+        self._buffers = [
+            [(np.empty(FLUSH_SIZE), np.empty(FLUSH_SIZE)) for _ in (False, True)]
+            for _ in (READ, WRITE)
+        ]
+        self._fill = [[0, 0] for _ in (READ, WRITE)]
+        # Operations per endpoint, indexed like config.endpoints (no hashing)
+        self.endpoint_counts = [0] * len(config.endpoints)
+        self.errors: Set[str] = set()
+        self.op_count = 0
+        # Operations completed in each second of the run, sized by run()
+        self.timeline: List[int] = []
+        self.started_ns = 0
+        self.finished_ns = 0
+        self._key_prefix = config.key_prefix.encode()
+        self._key_pool = [self.generate_random_key() for _ in range(1 << KEY_POOL_BITS)]
+        self._value_pool = [
+            os.urandom(config.value_size) for _ in range(1 << VALUE_POOL_BITS)
+        ]
+        # Token-bucket pacing state, only used when a target rate is set
+        self._send_interval = 0.0
+        self._next_send = 0.0
 
-    def generate_random_key(self) -> str:
+    def generate_random_key(self) -> bytes:
         """Generate a random key with the configured prefix"""
-        suffix = "".join(
-            random.choices(
-                string.ascii_letters + string.digits,
-                k=self.config.key_size - len(self.config.key_prefix) - 1,
+        suffix = bytes(
+            self._rng.choices(
+                KEY_ALPHABET, k=self.config.key_size - len(self._key_prefix) - 1
             )
         )
-        return f"{self.config.key_prefix}_{suffix}"
+        return b"%s_%s" % (self._key_prefix, suffix)
+
+    def next_key(self) -> bytes:
+        """Pick a random key from the pre-generated pool"""
+        return self._key_pool[self._rng.getrandbits(KEY_POOL_BITS)]
+
+    def next_value(self) -> bytes:
+        """Pick a random value from the pre-generated pool"""
+        return self._value_pool[self._rng.getrandbits(VALUE_POOL_BITS)]
+
+    def build_batch(self, client: aetcd.Client, is_write: bool) -> list:
+        """Build the Txn operations for one batch of reads or writes"""
+        if is_write:
+            # Distinct keys, since etcd rejects a Txn that puts the same key twice
+            keys = self._rng.sample(self._key_pool, self.config.batch_size)
+            return [client.transactions.put(key, self.next_value()) for key in keys]
+        return [
+            client.transactions.get(self.next_key())
+            for _ in range(self.config.batch_size)
+        ]
+
+    async def populate(self):
+        """Write every pooled key once, in full Txns, so reads hit existing keys"""
 
-    def generate_random_value(self) -> str:
-        """Generate a random value of configured size"""
-        return "".join(
-            random.choices(
-                string.ascii_letters + string.digits + " ", k=self.config.value_size
+        async def put_chunk(keys: List[bytes]):
+            _, client = self.sessions.next_session()
+            await client.transaction(
+                compare=[],
+                success=[client.transactions.put(k, self.next_value()) for k in keys],
+                failure=[],
+            )
+
+        # A Txn may not put the same key twice, so drop any pool duplicates
+        keys = list(dict.fromkeys(self._key_pool))
+        # Chunks are bounded by etcd's request size as well as its op count
+        chunk = max_txn_puts(self.config.key_size, self.config.value_size)
+        await asyncio.gather(
+            *(
+                put_chunk(keys[start : start + chunk])
+                for start in range(0, len(keys), chunk)
             )
         )
 
-    def perform_operation(self) -> OperationResult:
-        """Perform a single read or write operation"""
+    async def perform_operation(self, intended_ns: int = None):
+        """Perform a single read or write operation, or a batch of them in one Txn
+
+        Latency is measured from `intended_ns` when given, so time spent waiting
+        behind earlier operations counts (no coordinated omission).
+        """
         # Choose operation type based on write ratio
-        is_write = random.random() < self.config.write_ratio
-        operation = "write" if is_write else "read"
-
-        # Choose random endpoint
-        endpoint = random.choice(self.config.endpoints)
-        client = self.etcd_clients.get(endpoint)
-
-        if not client:
-            return OperationResult(
-                operation=operation,
-                success=False,
-                latency_ms=0,
-                timestamp=time.time(),
-                endpoint=endpoint,
-                error="No client available for endpoint",
-            )
+        is_write = self._rng.random() < self.config.write_ratio
+        batch_size = self.config.batch_size
+
+        # Rotate through the shared session pool, spreading load across endpoints
+        endpoint_idx, client = self.sessions.next_session()
+        success = False
 
-        start_time = time.perf_counter()
+        # Pick keys and values before starting the clock so only etcd is timed
+        if batch_size > 1:
+            ops = self.build_batch(client, is_write)
+        else:
+            key = self.next_key()
+            value = self.next_value() if is_write else None
+
+        start_ns = time.perf_counter_ns() if intended_ns is None else intended_ns
 
         try:
-            if is_write:
-                key = self.generate_random_key()
-                value = self.generate_random_value()
-                client.put(key, value)
+            if self.batcher:
+                # Queue one operation; the batcher shares a Txn with concurrent ones
+                await self.batcher.submit(endpoint_idx, client, key, value)
+            elif batch_size > 1:
+                # Amortize one round-trip over the whole batch
+                await client.transaction(compare=[], success=ops, failure=[])
+            elif is_write:
+                await client.put(key, value)
             else:
-                # For reads, try to read existing keys or generate new ones
-                key = self.generate_random_key()
-                result = client.get(key)
-                # We don't care if the key exists or not for benchmark purposes
-
-            end_time = time.perf_counter()
-            latency_ms = (end_time - start_time) * 1000
-
-            return OperationResult(
-                operation=operation,
-                success=True,
-                latency_ms=latency_ms,
-                timestamp=time.time(),
-                endpoint=endpoint,
-            )
+                # Keys come from the pre-populated pool, so reads find values
+                await client.get(key)
 
-        except Exception as e:
-            end_time = time.perf_counter()
-            latency_ms = (end_time - start_time) * 1000
-
-            return OperationResult(
-                operation=operation,
-                success=False,
-                latency_ms=latency_ms,
-                timestamp=time.time(),
-                endpoint=endpoint,
-                error=str(e),
-            )
+            success = True
 
-    def run(self, duration: int):
+        except Exception as e:
+            self.errors.add(str(e))
+
+        end_ns = time.perf_counter_ns()
+        # Batched operations each account for an equal share of the Txn
+        latency_ms = (end_ns - start_ns) / batch_size / 1e6
+
+        op = WRITE if is_write else READ
+        latencies, weights = self._buffers[op][success]
+        fill = self._fill[op][success]
+        latencies[fill] = latency_ms
+        weights[fill] = batch_size
+        self._fill[op][success] = fill + 1
+        if fill + 1 == FLUSH_SIZE:
+            self.flush_stream(op, success)
+        self.endpoint_counts[endpoint_idx] += batch_size
+
+        # Operations still completing after the deadline count to the last second
+        second = (end_ns - self.started_ns) // 1_000_000_000
+        self.timeline[min(second, len(self.timeline) - 1)] += batch_size
+
+        op_count = self.op_count
+        self.op_count = op_count + batch_size
+
+        # Publish the operation count whenever it crosses an interval boundary
+        if op_count // PROGRESS_INTERVAL != self.op_count // PROGRESS_INTERVAL:
+            if self.progress is not None:
+                self.progress[self.client_id] = self.op_count
+
+    async def throttle(self):
+        """Wait for this client's next send slot under the target rate"""
+        now = time.perf_counter()
+        send_at = max(self._next_send, now)
+        self._next_send = send_at + self._send_interval
+        if send_at > now:
+            await asyncio.sleep(send_at - now)
+
+    async def run(self, duration: int):
         """Run benchmark operations for specified duration"""
         self.running = True
-        start_time = time.time()
-
-        while self.running and (time.time() - start_time) < duration:
-            result = self.perform_operation()
-            self.results.append(result)
-
-            # Small delay to prevent overwhelming the cluster
-            time.sleep(0.001)  # 1ms delay
+        # Integer monotonic deadline: one cheap clock read and compare per loop
+        now_ns = time.perf_counter_ns()
+        deadline_ns = now_ns + int(duration * 1_000_000_000)
+        # Fixed per-second counters: memory depends on the duration alone
+        self.timeline = [0] * max(1, math.ceil(duration))
+
+        if self.config.target_rate > 0:
+            # Each client paces its share of the total target rate
+            self._send_interval = (
+                self.config.num_clients
+                * self.config.batch_size
+                / self.config.target_rate
+            )
+            self._next_send = time.perf_counter()
+
+        async def worker():
+            while self.running and time.perf_counter_ns() < deadline_ns:
+                if self._send_interval:
+                    await self.throttle()
+                await self.perform_operation()
+
+        async def open_loop():
+            # Poisson arrivals at this client's share of the target rate,
+            # issued whether or not earlier operations have completed
+            mean_gap_ns = self._send_interval * 1e9
+            intended_ns = time.perf_counter_ns()
+            pending = set()
+            while self.running and time.perf_counter_ns() < deadline_ns:
+                intended_ns += int(self._rng.expovariate(1.0) * mean_gap_ns)
+                delay_ns = intended_ns - time.perf_counter_ns()
+                if delay_ns > 0:
+                    await asyncio.sleep(delay_ns / 1e9)
+                task = asyncio.create_task(self.perform_operation(intended_ns))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending)
+
+        self.started_ns = time.perf_counter_ns()
+        if self.config.open_loop:
+            await open_loop()
+        else:
+            # Keep `inflight` operations outstanding on the event loop at once
+            await asyncio.gather(*(worker() for _ in range(self.config.inflight)))
+        self.finished_ns = time.perf_counter_ns()
+        if self.progress is not None:
+            self.progress[self.client_id] = self.op_count
+
+        for op in (READ, WRITE):
+            for success in (False, True):
+                self.flush_stream(op, success)
+
+    def flush_stream(self, op: int, success: bool):
+        """Fold buffered latencies into the stream's summary and t-digest"""
+        fill = self._fill[op][success]
+        if not fill:
+            return
+        self._fill[op][success] = 0
+
+        latencies, weights = self._buffers[op][success]
+        x = latencies[:fill]
+        w = weights[:fill]
+        self.stats[op][success] = self.stats[op][success].merge(
+            OnlineStats.from_samples(x, w)
+        )
+        if success:
+            self.digests[op].update(x, w)
 
     def stop(self):
         """Stop the benchmark client"""
         self.running = False
 
+    def summary(self) -> ClientStats:
+        """Collect this client's statistics for the parent process"""
+        return ClientStats(
+            stats=self.stats,
+            digests=self.digests,
+            endpoint_counts=self.endpoint_counts,
+            errors=self.errors,
+            timeline=self.timeline,
+            started_ns=self.started_ns,
+            finished_ns=self.finished_ns,
+        )
+
+
+# Shared per-client operation counts, start barrier and measured start time,
+# set in each worker
+_progress = None
+_start_barrier = None
+_start_ns = None
+
+
+def _init_worker(progress, start_barrier, start_ns):
+    """Initialize a benchmark worker process"""
+    global _progress, _start_barrier, _start_ns
+    _progress = progress
+    _start_barrier = start_barrier
+    _start_ns = start_ns
+
+
+def run_client(config: BenchmarkConfig, client_id: int) -> ClientStats:
+    """Run one benchmark client on its own event loop in a worker process"""
+    try:
+        return asyncio.run(_run_client(config, client_id))
+    except BaseException:
+        # Release clients waiting at the start barrier instead of hanging them
+        _start_barrier.abort()
+        raise
+
+
+async def _run_client(config: BenchmarkConfig, client_id: int) -> ClientStats:
+    """Connect a worker-local session pool and run one client on it"""
+    # Sessions are per process; gRPC channels cannot cross process boundaries
+    sessions = EtcdSessionPool(config)
+    await sessions.connect()
+    batcher = TxnBatcher(config) if config.batch_max_size > 1 else None
+    try:
+        if batcher:
+            batcher.start()
+        client = EtcdBenchmarkClient(client_id, config, sessions, _progress, batcher)
+        await client.populate()
+        if config.warmup_time > 0:
+            # Same code path at full rate, warming connections and the cluster;
+            # the warmup client's statistics are discarded
+            warmup = EtcdBenchmarkClient(client_id, config, sessions, batcher=batcher)
+            await warmup.run(config.warmup_time)
+        # Workers spawn, populate and warm up at different speeds; start every
+        # measured run together so they all overlap for the whole duration
+        if await asyncio.to_thread(_start_barrier.wait) == 0:
+            # One worker publishes the common start for the progress reporter
+            _start_ns.value = time.perf_counter_ns()
+        await client.run(config.duration)
+    finally:
+        if batcher:
+            await batcher.stop()
+        await sessions.close()
+    return client.summary()
+
 
 class EtcdBenchmark:
     """Main benchmark orchestrator"""
 
     def __init__(self, config: BenchmarkConfig):
         self.config = config
-        self.clients: List[EtcdBenchmarkClient] = []
+        self.client_stats: List[ClientStats] = []
         self.results = BenchmarkResults()
+        self.start_ns = 0
 
-    def detect_cluster_nodes(self) -> List[str]:
+    async def detect_cluster_nodes(self) -> List[str]:
         """Detect available etcd nodes if not specified"""
-        endpoints = []
         base_port = 2379
 
-        for i in range(1, 11):  # Check ports 2379-2388
-            port = base_port + i - 1
-            endpoint = f"http://localhost:{port}"
+        async def probe(port: int) -> bool:
             try:
-                client = etcd3.client(host="localhost", port=port)
-                # Test connection with a simple operation
-                client.status()
+                async with aetcd.Client(host="localhost", port=port) as client:
+                    # Test connection with a simple operation
+                    await client.status()
+                return True
+            except Exception:
+                return False  # Node not available
+
+        # Probe ports 2379-2388 concurrently; results keep port order
+        ports = [base_port + i for i in range(10)]
+        found = await asyncio.gather(*(probe(port) for port in ports))
+
+        endpoints = []
+        for port, ok in zip(ports, found):
+            if ok:
+                endpoint = f"http://localhost:{port}"
                 endpoints.append(endpoint)
                 print(f"✓ Detected etcd node at {endpoint}")
-            except Exception:
-                continue  # Node not available
 
         return endpoints
 
-    def prepare_benchmark(self):
+    async def prepare_benchmark(self):
         """Prepare the benchmark environment"""
         print("Preparing benchmark environment...")
 
         # Auto-detect cluster nodes if not specified
         if not self.config.endpoints:
-            detected_endpoints = self.detect_cluster_nodes()
+            detected_endpoints = await self.detect_cluster_nodes()
             if not detected_endpoints:
                 raise RuntimeError(
                     "No etcd nodes detected. Please start the cluster first."
@@ -237,146 +657,186 @@ class EtcdBenchmark:
         print(f"Using endpoints: {self.config.endpoints}")
         print(f"Benchmark configuration:")
         print(f"  - Clients: {self.config.num_clients}")
+        print(f"  - In-flight ops per client: {self.config.inflight}")
+        print(f"  - Sessions per endpoint: {self.config.pool_size}")
+        print(f"  - Batch size: {self.config.batch_size} ops/Txn")
+        if self.config.batch_max_size > 1:
+            print(
+                f"  - Async batching: up to {self.config.batch_max_size} ops/Txn, "
+                f"{self.config.batch_max_wait_us}us window"
+            )
+        if self.config.target_rate > 0:
+            print(f"  - Target rate: {self.config.target_rate:.0f} ops/sec")
+        if self.config.open_loop:
+            print("  - Arrivals: open-loop (Poisson)")
         print(f"  - Duration: {self.config.duration}s")
         print(f"  - Write ratio: {self.config.write_ratio:.1%}")
         print(f"  - Key size: {self.config.key_size} bytes")
         print(f"  - Value size: {self.config.value_size} bytes")
 
-        # Create benchmark clients
-        self.clients = [
-            EtcdBenchmarkClient(i, self.config) for i in range(self.config.num_clients)
-        ]
-
-        # Warmup phase
-        if self.config.warmup_time > 0:
-            print(f"\nWarming up for {self.config.warmup_time}s...")
-            self.run_warmup()
-
-    def run_warmup(self):
-        """Run warmup operations to prepare the cluster"""
-        warmup_client = EtcdBenchmarkClient(0, self.config)
-
-        for _ in range(100):  # Perform 100 warmup operations
-            warmup_client.perform_operation()
-            time.sleep(0.01)
-
-    def run_benchmark(self):
+    async def run_benchmark(self):
         """Execute the main benchmark"""
         print(f"\nStarting benchmark with {self.config.num_clients} clients...")
+        if self.config.warmup_time > 0:
+            print(f"Warming up for {self.config.warmup_time}s first...")
+
+        # Each client runs in its own process so client-side work uses every core
+        num_clients = self.config.num_clients
+        # Spawn rather than fork: a forked child would inherit live gRPC state
+        context = multiprocessing.get_context("spawn")
+        progress = context.Array("q", num_clients, lock=False)
+        start_barrier = context.Barrier(num_clients)
+        start_ns = context.Value("q", 0, lock=False)
+        loop = asyncio.get_running_loop()
+        clients_done = asyncio.Event()
+
+        with ProcessPoolExecutor(
+            max_workers=num_clients,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(progress, start_barrier, start_ns),
+        ) as executor:
+
+            async def run_clients():
+                try:
+                    self.client_stats = await asyncio.gather(
+                        *(
+                            loop.run_in_executor(
+                                executor, run_client, self.config, client_id
+                            )
+                            for client_id in range(num_clients)
+                        )
+                    )
+                finally:
+                    clients_done.set()
+
+            # Report progress until all clients have finished
+            await asyncio.gather(
+                run_clients(),
+                self.report_progress(start_ns, progress, clients_done),
+            )
 
-        # Start all clients in separate threads
-        threads = []
-        start_time = time.time()
-
-        for client in self.clients:
-            thread = threading.Thread(target=client.run, args=(self.config.duration,))
-            thread.start()
-            threads.append(thread)
-
-        # Progress reporting
-        self.report_progress(start_time)
-
-        # Wait for all clients to finish
-        for thread in threads:
-            thread.join()
-
-        end_time = time.time()
-        actual_duration = end_time - start_time
+        # Clients start together at the barrier, so the duration is their mean
+        # run; perf_counter_ns is system-wide monotonic, so worker clocks line up
+        windows = [stats.finished_ns - stats.started_ns for stats in self.client_stats]
+        actual_duration = sum(windows) / len(windows) / 1e9
+
+        # The span covering every client's run only serves as a check
+        self.start_ns = min(stats.started_ns for stats in self.client_stats)
+        end_ns = max(stats.finished_ns for stats in self.client_stats)
+        span = (end_ns - self.start_ns) / 1e9
+        if span > actual_duration * 1.05:
+            print(
+                f"⚠ Client runs were not aligned: they spanned {span:.2f}s "
+                f"for a {actual_duration:.2f}s mean run"
+            )
 
         print(f"\nBenchmark completed in {actual_duration:.2f}s")
         return actual_duration
 
-    def report_progress(self, start_time: float):
+    async def report_progress(self, start_ns, progress, done: asyncio.Event):
         """Report progress during benchmark execution"""
-        last_report = 0
-
         while True:
-            elapsed = time.time() - start_time
-
-            if elapsed >= self.config.duration:
+            try:
+                # Wake up every report interval, or as soon as the clients finish
+                await asyncio.wait_for(done.wait(), self.config.report_interval)
                 break
-
-            if elapsed - last_report >= self.config.report_interval:
-                # Calculate current stats
-                total_ops = sum(len(client.results) for client in self.clients)
-                ops_per_sec = total_ops / elapsed if elapsed > 0 else 0
-
-                print(
-                    f"Progress: {elapsed:.0f}s / {self.config.duration}s | "
-                    f"Operations: {total_ops} | "
-                    f"Throughput: {ops_per_sec:.1f} ops/sec"
-                )
-
-                last_report = elapsed
-
-            time.sleep(1)
+            except asyncio.TimeoutError:
+                pass
+
+            # Calculate current stats from the counts the workers publish;
+            # the start is published once every worker has populated and
+            # warmed up, so it excludes that setup time
+            total_ops = sum(progress)
+            if not start_ns.value or not total_ops:
+                continue  # Still starting up
+
+            elapsed = (time.perf_counter_ns() - start_ns.value) / 1e9
+            ops_per_sec = total_ops / elapsed if elapsed > 0 else 0
+
+            print(
+                f"Progress: {elapsed:.0f}s / {self.config.duration}s | "
+                f"Operations: {total_ops} | "
+                f"Throughput: {ops_per_sec:.1f} ops/sec"
+            )
 
     def analyze_results(self, actual_duration: float) -> BenchmarkResults:
         """Analyze and aggregate benchmark results"""
         print("\nAnalyzing results...")
 
-        all_results: List[OperationResult] = []
-        for client in self.clients:
-            all_results.extend(client.results)
+        # Merge the clients' streaming summaries, indexed [operation][success]
+        stats = [[OnlineStats(), OnlineStats()] for _ in (READ, WRITE)]
+        errors = set()
+        for client in self.client_stats:
+            for op in (READ, WRITE):
+                for success in (False, True):
+                    stats[op][success] = stats[op][success].merge(
+                        client.stats[op][success]
+                    )
+            errors |= client.errors
+
+        # Sum the clients' per-endpoint counters in one vectorized pass
+        endpoint_counts = np.sum(
+            [client.endpoint_counts for client in self.client_stats], axis=0
+        )
 
-        if not all_results:
+        # Basic statistics
+        total_reads = stats[READ][False].n + stats[READ][True].n
+        total_writes = stats[WRITE][False].n + stats[WRITE][True].n
+        total_ops = total_reads + total_writes
+        if not total_ops:
             raise RuntimeError("No results to analyze")
 
-        # Basic statistics
-        total_ops = len(all_results)
-        successful_ops = sum(1 for r in all_results if r.success)
+        successful_reads = stats[READ][True].n
+        successful_writes = stats[WRITE][True].n
+        successful_ops = successful_reads + successful_writes
         failed_ops = total_ops - successful_ops
 
-        reads = [r for r in all_results if r.operation == "read"]
-        writes = [r for r in all_results if r.operation == "write"]
-        successful_reads = [r for r in reads if r.success]
-        successful_writes = [r for r in writes if r.success]
-
-        # Latency statistics
-        successful_latencies = [r.latency_ms for r in all_results if r.success]
-        read_latencies = [r.latency_ms for r in successful_reads]
-        write_latencies = [r.latency_ms for r in successful_writes]
-
-        # Endpoint distribution
-        endpoint_counts = defaultdict(int)
-        for result in all_results:
-            endpoint_counts[result.endpoint] += 1
-
-        # Error collection
-        errors = [r.error for r in all_results if not r.success and r.error]
-
-        # Calculate statistics
-        def calc_percentiles(data):
-            if not data:
-                return 0, 0, 0, 0, 0, 0
+        # Throughput timeline: the clients start together, so their per-second
+        # counters line up and simply add
+        timeline = np.sum([client.timeline for client in self.client_stats], axis=0)
+
+        # Calculate statistics (in ms); percentiles come from merged t-digests
+        def calc_percentiles(summary: OnlineStats, digests):
+            if not summary.n:
+                return 0, 0, 0, 0, 0, 0, 0
+            merged = crick.TDigest()
+            merged.merge(*digests)
+            p50, p95, p99 = merged.quantile([0.50, 0.95, 0.99])
             return (
-                statistics.mean(data),
-                min(data),
-                max(data),
-                statistics.median(data),
-                self.percentile(data, 0.95),
-                self.percentile(data, 0.99),
+                summary.mean,
+                summary.min,
+                summary.max,
+                float(p50),
+                float(p95),
+                float(p99),
+                summary.stddev,
             )
 
-        avg_lat, min_lat, max_lat, p50_lat, p95_lat, p99_lat = calc_percentiles(
-            successful_latencies
+        avg_lat, min_lat, max_lat, p50_lat, p95_lat, p99_lat, _ = calc_percentiles(
+            stats[READ][True].merge(stats[WRITE][True]),
+            [d for client in self.client_stats for d in client.digests],
+        )
+        read_stats = calc_percentiles(
+            stats[READ][True], [client.digests[READ] for client in self.client_stats]
+        )
+        write_stats = calc_percentiles(
+            stats[WRITE][True], [client.digests[WRITE] for client in self.client_stats]
         )
-        read_stats = calc_percentiles(read_latencies)
-        write_stats = calc_percentiles(write_latencies)
 
         # Create results object
         self.results = BenchmarkResults(
             total_operations=total_ops,
             successful_operations=successful_ops,
             failed_operations=failed_ops,
-            total_reads=len(reads),
-            total_writes=len(writes),
-            successful_reads=len(successful_reads),
-            successful_writes=len(successful_writes),
+            total_reads=total_reads,
+            total_writes=total_writes,
+            successful_reads=successful_reads,
+            successful_writes=successful_writes,
             duration_seconds=actual_duration,
             throughput_ops_per_sec=successful_ops / actual_duration,
-            read_throughput=len(successful_reads) / actual_duration,
-            write_throughput=len(successful_writes) / actual_duration,
+            read_throughput=successful_reads / actual_duration,
+            write_throughput=successful_writes / actual_duration,
             avg_latency_ms=avg_lat,
             min_latency_ms=min_lat,
             max_latency_ms=max_lat,
@@ -390,6 +850,7 @@ class EtcdBenchmark:
                 "p50": read_stats[3],
                 "p95": read_stats[4],
                 "p99": read_stats[5],
+                "stddev": read_stats[6],
             },
             write_latency_stats={
                 "avg": write_stats[0],
@@ -398,20 +859,19 @@ class EtcdBenchmark:
                 "p50": write_stats[3],
                 "p95": write_stats[4],
                 "p99": write_stats[5],
+                "stddev": write_stats[6],
+            },
+            endpoint_distribution={
+                endpoint: int(count)
+                for endpoint, count in zip(self.config.endpoints, endpoint_counts)
+                if count
             },
-            endpoint_distribution=dict(endpoint_counts),
-            errors=list(set(errors)),  # Unique errors
+            errors=list(errors),  # Unique errors
+            throughput_timeline=timeline.tolist(),
         )
 
         return self.results
 
-    @staticmethod
-    def percentile(data, p):
-        """Calculate percentile of data"""
-        if not data:
-            return 0
-        return statistics.quantiles(data, n=100)[int(p * 100) - 1]
-
     def print_results(self):
         """Print formatted benchmark results"""
         r = self.results
@@ -475,12 +935,31 @@ class EtcdBenchmark:
         results_dict["timestamp"] = datetime.now().isoformat()
         results_dict["config"] = asdict(self.config)
 
-        with open(filename, "w") as f:
-            json.dump(results_dict, f, indent=2)
+        with open(filename, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    results_dict,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                )
+            )
 
         print(f"Results saved to {filename}")
 
 
+async def main_async(config: BenchmarkConfig, output: str = None):
+    """Prepare, run and report the benchmark from the parent process"""
+    benchmark = EtcdBenchmark(config)
+    await benchmark.prepare_benchmark()
+    actual_duration = await benchmark.run_benchmark()
+
+    benchmark.analyze_results(actual_duration)
+    benchmark.print_results()
+
+    # Save results if requested
+    if output:
+        benchmark.save_results_json(output)
+
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(description="ETCD Cluster Benchmark Tool")
@@ -498,6 +977,52 @@ def main():
         default=10,
         help="Number of concurrent clients (default: 10)",
     )
+    parser.add_argument(
+        "--inflight",
+        "-i",
+        type=int,
+        default=16,
+        help="Concurrent in-flight operations per client (default: 16)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        "-b",
+        type=int,
+        default=1,
+        help="Operations submitted per etcd Txn (1-128, default: 1 = no batching)",
+    )
+    parser.add_argument(
+        "--batch-max-size",
+        type=int,
+        default=1,
+        help="Pack up to this many concurrently queued ops per endpoint into one "
+        "Txn (1-128, default: 1 = no async batching)",
+    )
+    parser.add_argument(
+        "--batch-max-wait-us",
+        type=int,
+        default=0,
+        help="Microseconds to wait for more ops before sending a partial async "
+        "batch (default: 0)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=8,
+        help="etcd sessions per endpoint in each client process (default: 8)",
+    )
+    parser.add_argument(
+        "--target-rate",
+        type=float,
+        default=0,
+        help="Cap total throughput in ops/sec across all clients (default: 0 = unlimited)",
+    )
+    parser.add_argument(
+        "--open-loop",
+        action="store_true",
+        help="Issue operations as Poisson arrivals at --target-rate, independent "
+        "of completions, and measure latency from each intended start",
+    )
     parser.add_argument(
         "--duration",
         "-d",
@@ -540,11 +1065,51 @@ def main():
     if args.write_ratio < 0 or args.write_ratio > 1:
         print("Error: Write ratio must be between 0.0 and 1.0")
         return 1
+    if args.inflight < 1:
+        print("Error: In-flight operations must be at least 1")
+        return 1
+    if args.pool_size < 1:
+        print("Error: Pool size must be at least 1")
+        return 1
+    if args.target_rate < 0:
+        print("Error: Target rate cannot be negative")
+        return 1
+    if args.open_loop and args.target_rate <= 0:
+        print("Error: --open-loop requires a --target-rate")
+        return 1
+    # etcd rejects Txns with more than --max-txn-ops operations or
+    # --max-request-bytes of payload, so large values allow fewer ops per Txn
+    max_batch = max_txn_puts(args.key_size, args.value_size)
+    if args.batch_size < 1 or args.batch_size > max_batch:
+        print(
+            f"Error: Batch size must be between 1 and {max_batch} "
+            f"for {args.value_size}-byte values"
+        )
+        return 1
+    if args.batch_max_size < 1 or args.batch_max_size > max_batch:
+        print(
+            f"Error: Batch max size must be between 1 and {max_batch} "
+            f"for {args.value_size}-byte values"
+        )
+        return 1
+    if args.batch_max_wait_us < 0:
+        print("Error: Batch max wait cannot be negative")
+        return 1
+    if args.batch_size > 1 and args.batch_max_size > 1:
+        print("Error: --batch-size and --batch-max-size cannot be combined")
+        return 1
 
     # Create configuration
     config = BenchmarkConfig(
         endpoints=args.endpoints or [],
         num_clients=args.clients,
+        inflight=args.inflight,
+        batch_size=args.batch_size,
+        batch_max_size=args.batch_max_size,
+        batch_max_wait_us=args.batch_max_wait_us,
+        pool_size=args.pool_size,
+        target_rate=args.target_rate,
+        open_loop=args.open_loop,
         duration=args.duration,
         write_ratio=args.write_ratio,
         key_size=args.key_size,
@@ -555,17 +1120,7 @@ def main():
 
     try:
         # Create and run benchmark
-        benchmark = EtcdBenchmark(config)
-        benchmark.prepare_benchmark()
-
-        actual_duration = benchmark.run_benchmark()
-        benchmark.analyze_results(actual_duration)
-        benchmark.print_results()
-
-        # Save results if requested
-        if args.output:
-            benchmark.save_results_json(args.output)
-
+        asyncio.run(main_async(config, args.output))
         return 0
 
     except KeyboardInterrupt:
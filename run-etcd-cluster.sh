@@ -139,14 +139,14 @@ wait_for_cluster() {
     local attempt=0
     
     while [ $ready_nodes -lt $num_nodes ] && [ $attempt -lt $max_attempts ]; do
+        # One exec checks every member; --cluster already covers the whole cluster
+        local health=$(docker exec etcd-node-1 /usr/local/bin/etcdctl endpoint health --cluster 2>&1 || true)
         ready_nodes=0
-        
-        for ((i=1; i<=num_nodes; i++)); do
-            local node_name="etcd-node-$i"
-            if docker exec $node_name /usr/local/bin/etcdctl endpoint health --cluster >/dev/null 2>&1; then
+        while IFS= read -r line; do
+            if [[ $line == *"is healthy"* ]]; then
                 ready_nodes=$((ready_nodes + 1))
             fi
-        done
+        done <<< "$health"
         
         if [ $ready_nodes -lt $num_nodes ]; then
             echo "  $ready_nodes/$num_nodes nodes ready, waiting..."